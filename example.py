@@ -9,3 +9,11 @@ Aditya Marathe
 import pysyn
 
 mix = pysyn.Mixer()
+
+mix.add_track(
+    osc=pysyn.Oscillator(wave='Sine'),
+    steps=[('A4', '0.5'), ('C#5', '0.5'), ('R', '0.25'), ('E5', '1')],
+    name='Track 1'
+)
+
+mix.compile_()
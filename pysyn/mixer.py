@@ -10,6 +10,15 @@ __all__ = ['Mixer']
 
 from typing import Any
 
+from concurrent.futures import ThreadPoolExecutor
+
+import os
+import threading
+
+import numpy as np
+import numpy.typing as npt
+
+from pysyn.osc import _SAMPLE_DTYPE
 from pysyn.osc import Oscillator
 from pysyn.track import Track
 
@@ -20,10 +29,15 @@ class Mixer:
 
     Mixes the tracks of several oscillators.
     """
+
+    __slots__ = ['_tracks', '_levels', '_mix']
+
     def __init__(self) -> None:
         self._tracks: dict[str, Track] = {}
         self._levels: dict[str, float] = {}
 
+        self._mix: npt.NDArray | None = None
+
     def add_track(
             self,
             osc: Oscillator,
@@ -45,11 +59,53 @@ class Mixer:
         """
         Compiles all the tracks in this mix.
         """
-        for name, track in self._tracks.items():
-            compiled_track = track.compile_()
+        num_samples = max(
+            (track.get_num_samples() for track in self._tracks.values()),
+            default=0
+        )
+
+        self._mix = np.zeros(num_samples, dtype=_SAMPLE_DTYPE)
+        self.compile_to(self._mix)
+
+    def compile_to(self, out: npt.NDArray) -> None:
+        """\
+        Compiles all the tracks in this mix, adding them to an existing buffer.
+
+        Args:
+
+        out: npt.NDArray
+            Buffer which the mix is added to - must have at least as many
+            samples as the longest track.
+
+        Notes:
+
+        Each track adds its steps straight into the buffer at its level, so no
+        track is compiled to a separate full-length array before mixing.
+
+        Tracks are compiled concurrently over a pool of threads (NumPy releases
+        the GIL during array operations). Every thread adds its steps straight
+        into the shared buffer, under a lock which is only held for the
+        addition, so no per-thread buffers are allocated or summed.
+        """
+        tracks = [
+            (track, self._levels[name]) for name, track in self._tracks.items()
+        ]
+        num_workers = min(len(tracks), os.cpu_count() or 1)
+
+        if num_workers <= 1:
+            for track, level in tracks:
+                track.compile_to(out, level)
+
+            return
 
-            # TODO: Need to first implement the step sequencer...
+        lock = threading.Lock()
 
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            # Consumes the results so that exceptions from the threads are
+            # raised here
+            list(executor.map(
+                lambda item: item[0].compile_to(out, item[1], lock), tracks
+            ))
 
     def play(self) -> None:
         ...
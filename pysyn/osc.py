@@ -11,6 +11,7 @@ __all__ = [
     'print_oscillators',
     'Oscillators',
     'Oscillator',
+    'oscillate_bank',
     'fourier_transform'
 ]
 
@@ -19,6 +20,9 @@ from typing import TypeAlias
 from typing import Literal
 
 from enum import Enum
+from functools import lru_cache
+
+import math
 
 import numpy as np
 import numpy.typing as npt
@@ -28,112 +32,313 @@ from pysyn.time import Time
 
 
 Wave: TypeAlias = Literal['Sine', 'Square', 'Triangle', 'Sawtooth']
-WaveGenerator: TypeAlias = Callable[[npt.NDArray, float, float], npt.NDArray]
+WaveGenerator: TypeAlias = Callable[
+    [npt.NDArray, float, float, npt.NDArray], npt.NDArray
+]
+GridGenerator: TypeAlias = Callable[[float, float, npt.NDArray], npt.NDArray]
+OscillatorCall: TypeAlias = Callable[
+    [Time, float, float, npt.NDArray], npt.NDArray
+]
+
+# Radians in a full cycle, hoisted out of the generators
+_TAU: float = 2 * math.pi
+
+# Data type of the generated waveforms - single precision is well beyond the
+# resolution of 16/24-bit audio, and halves the memory traffic of double
+_SAMPLE_DTYPE: type[np.floating] = np.float32
+
+# Number of samples processed at a time - sized to fit in the L1/L2 cache
+_BLOCK_SIZE: int = 8_192
+
+# Oscillations shorter than this are calculated with `sin` directly, as the
+# setup of the angle addition sine generator outweighs its savings
+_MIN_RECURRENCE_SIZE: int = 2_048
+
+# Sample offsets within a block, calculated once at import for all generators
+_BLOCK_OFFSETS: npt.NDArray = np.arange(_BLOCK_SIZE, dtype=np.uint32)
+_BLOCK_OFFSETS.flags.writeable = False
+
+# Typical per-core L2 cache size in bytes, used to size oscillator bank blocks
+_L2_CACHE_SIZE: int = 262_144
 
 # Wave generation stuff --------------------------------------------------------
 
 
-def _generate_sin(t: npt.NDArray, freq: float, phase: float) -> npt.NDArray:
+def _sin_recurrence(
+        omega: float,
+        theta0: float,
+        out: npt.NDArray
+    ) -> npt.NDArray:
     """\
-    [PySyn Internal] Sine wave generator.
+    [PySyn Internal] Sine wave generator for a uniform sample grid.
 
     Args:
 
-    t: npt.NDArray
-        Time array which defines the duration of the oscillations.
+    omega: float
+        Phase increment per sample in radians.
 
-    freq: float
-        Frequency of the oscillator.
+    theta0: float
+        Phase angle of the first sample in radians.
 
-    phase: float
-        Phase of the oscillator in radians.
+    out: npt.NDArray
+        Array which the waveform is written into - its length is the number of
+        samples to generate.
 
     Returns:
 
     npt.NDArray
-        The generated waveform at the given parameters.
+        The `out` array, holding the generated waveform at the given
+        parameters.
+
+    Notes:
+
+    Uses the angle addition identity `sin(a + b) = sin(a)cos(b) + cos(a)sin(b)`
+    where the samples are laid out as rows, `a` is the phase at the start of a
+    row and `b` is the phase offset within the row. Only the offsets of one row
+    and the starts of every row need `sin` and `cos`, so the remaining samples
+    each cost two multiplications and an addition. As `a` is evaluated exactly
+    for every row, there is no accumulated drift.
+
+    The row length grows with the number of samples (about its square root, but
+    with at most 64 rows until a row fills a block), which keeps the number of
+    `sin` and `cos` evaluations small for both short steps and long tones. Very
+    short oscillations are cheaper to calculate with `sin` directly.
     """
-    return np.sin(2 * np.pi * freq * t + phase)
+    size = len(out)
+
+    if size < _MIN_RECURRENCE_SIZE:
+        theta = np.multiply(_BLOCK_OFFSETS[:size], omega)
+        theta += theta0
+        return np.sin(theta, out=out)
+
+    row_size = min(_BLOCK_SIZE, max(math.isqrt(size), -(-size // 64)))
+    num_rows, tail = divmod(size, row_size)
+
+    offsets = np.multiply(_BLOCK_OFFSETS[:row_size], omega)
+    cos_b = np.cos(offsets).astype(out.dtype)
+    sin_b = np.sin(offsets).astype(out.dtype)
+
+    starts = np.arange(num_rows + 1, dtype=float)
+    starts *= omega * row_size
+    starts += theta0
+    cos_a = np.cos(starts).astype(out.dtype)[:, None]
+    sin_a = np.sin(starts).astype(out.dtype)[:, None]
 
+    # Rows are processed a block at a time, so the scratch buffer stays small
 
-def _generate_sqr(t: npt.NDArray, freq: float, phase: float) -> npt.NDArray:
+    rows_per_block = max(1, _BLOCK_SIZE // row_size)
+    grid = out[:num_rows * row_size].reshape(num_rows, row_size)
+    scratch = np.empty(
+        (min(num_rows, rows_per_block), row_size), dtype=out.dtype
+    )
+
+    for i in range(0, num_rows, rows_per_block):
+        rows = grid[i:i + rows_per_block]
+        k = len(rows)
+
+        np.multiply(sin_a[i:i + k], cos_b, out=rows)
+        np.multiply(cos_a[i:i + k], sin_b, out=scratch[:k])
+        rows += scratch[:k]
+
+    if tail:
+        end = out[num_rows * row_size:]
+
+        np.multiply(cos_b[:tail], sin_a[num_rows, 0], out=end)
+        np.multiply(sin_b[:tail], cos_a[num_rows, 0], out=scratch[0, :tail])
+        end += scratch[0, :tail]
+
+    return out
+
+
+def _phase_accumulator(n: int, omega: float, theta0: float) -> npt.NDArray:
     """\
-    [PySyn Internal] Square wave generator.
+    [PySyn Internal] Fixed-point phase accumulator for a uniform sample grid.
 
     Args:
 
-    t: npt.NDArray
-        Time array which defines the duration of the oscillations.
+    n: int
+        Number of samples to generate.
 
-    freq: float
-        Frequency of the oscillator.
+    omega: float
+        Phase increment per sample in radians.
 
-    phase: float
-        Phase of the oscillator in radians.
+    theta0: float
+        Phase angle of the first sample in radians.
+
+    Returns:
+
+    npt.NDArray
+        Array of unsigned 32-bit integers, where a full cycle spans the whole
+        integer range.
+
+    Notes:
+
+    Unsigned integer overflow wraps around, so the modulo of the phase by a
+    full cycle is free - no `floor` is required. The accumulator is re-anchored
+    to the exact phase at the start of every block, so rounding of the phase
+    increment does not drift over long durations.
+    """
+    cycle = 2 ** 32
+
+    inc = round(omega / _TAU * cycle) % cycle
+
+    ramp = np.multiply(_BLOCK_OFFSETS[:n], np.uint32(inc))
+
+    acc = np.empty(n, dtype=np.uint32)
+
+    for i in range(0, n, _BLOCK_SIZE):
+        block = acc[i:i + _BLOCK_SIZE]
+        acc0 = round((theta0 + omega * i) / _TAU % 1 * cycle) % cycle
+
+        np.add(ramp[:len(block)], np.uint32(acc0), out=block)
+
+    return acc
+
+
+def _saw_accumulator(
+        omega: float,
+        theta0: float,
+        out: npt.NDArray
+    ) -> npt.NDArray:
+    """\
+    [PySyn Internal] Sawtooth wave generator for a uniform sample grid.
+
+    Args:
+
+    omega: float
+        Phase increment per sample in radians.
+
+    theta0: float
+        Phase angle of the first sample in radians.
+
+    out: npt.NDArray
+        Array which the waveform is written into - its length is the number of
+        samples to generate.
 
     Returns:
 
     npt.NDArray
-        The generated waveform at the given parameters.
+        The `out` array, holding the generated waveform at the given
+        parameters.
+
+    Notes:
+
+    Reinterpreting the phase accumulator as a signed integer maps a cycle
+    directly onto the sawtooth ramp from -1 to 1.
     """
-    return np.sign(np.sin(2 * np.pi * freq * t + phase))
+    acc = _phase_accumulator(len(out), omega, theta0)
+    return np.multiply(acc.view(np.int32), 1 / 2 ** 31, out=out)
 
 
-def _generate_tri(t: npt.NDArray, freq: float, phase: float) -> npt.NDArray:
+def _sqr_accumulator(
+        omega: float,
+        theta0: float,
+        out: npt.NDArray
+    ) -> npt.NDArray:
     """\
-    [PySyn Internal] Triangle wave generator.
+    [PySyn Internal] Square wave generator for a uniform sample grid.
 
     Args:
 
-    t: npt.NDArray
-        Time array which defines the duration of the oscillations.
+    omega: float
+        Phase increment per sample in radians.
 
-    freq: float
-        Frequency of the oscillator.
+    theta0: float
+        Phase angle of the first sample in radians.
 
-    phase: float
-        Phase of the oscillator in radians.
+    out: npt.NDArray
+        Array which the waveform is written into - its length is the number of
+        samples to generate.
 
     Returns:
 
     npt.NDArray
-        The generated waveform at the given parameters.
+        The `out` array, holding the generated waveform at the given
+        parameters.
+
+    Notes:
+
+    The top bit of the phase accumulator is set for the second half of each
+    cycle, which maps directly onto the square wave - no `sin` is required.
     """
-    return 2 * np.arcsin(np.sin(2 * np.pi * freq * t + phase)) / np.pi
+    acc = _phase_accumulator(len(out), omega, theta0)
+    acc >>= 31
+
+    np.multiply(acc, -2, out=out, dtype=out.dtype)
+    out += 1
+
+    return out
 
 
-def _generate_saw(t: npt.NDArray, freq: float, phase: float) -> npt.NDArray:
+def _tri_accumulator(
+        omega: float,
+        theta0: float,
+        out: npt.NDArray
+    ) -> npt.NDArray:
     """\
-    [PySyn Internal] Sawtooth wave generator.
+    [PySyn Internal] Triangle wave generator for a uniform sample grid.
 
     Args:
 
-    t: npt.NDArray
-        Time array which defines the duration of the oscillations.
+    omega: float
+        Phase increment per sample in radians.
 
-    freq: float
-        Frequency of the oscillator.
+    theta0: float
+        Phase angle of the first sample in radians.
 
-    phase: float
-        Phase of the oscillator in radians.
+    out: npt.NDArray
+        Array which the waveform is written into - its length is the number of
+        samples to generate.
 
     Returns:
 
     npt.NDArray
-        The generated waveform at the given parameters.
+        The `out` array, holding the generated waveform at the given
+        parameters.
+
+    Notes:
+
+    The triangle wave is the magnitude of a sawtooth a quarter cycle ahead,
+    rescaled from [0, 1] to [-1, 1] - no `sin` or `arcsin` is required.
     """
-    offset = phase / (2 * np.pi)
-    return 2 * (freq * t + offset - np.floor(0.5 + freq * t + offset))
+    acc = _phase_accumulator(len(out), omega, theta0)
+    acc += np.uint32(2 ** 30)
+
+    np.multiply(acc.view(np.int32), 1 / 2 ** 30, out=out)
+    np.abs(out, out=out)
+    out -= 1
 
+    return out
 
-_oscs: dict[str, WaveGenerator] = {
-    # Initialises with the default PySyn oscillators
-    'Sine': _generate_sin,
-    'Square': _generate_sqr,
-    'Triangle': _generate_tri,
-    'Sawtooth': _generate_saw
+
+_wave_ids: dict[str, int] = {
+    # Initialises with the default PySyn oscillators - the IDs index the
+    # generator tuples below
+    'Sine': 0,
+    'Square': 1,
+    'Triangle': 2,
+    'Sawtooth': 3
 }
 
+_oscs: tuple[WaveGenerator | None, ...] = (
+    # Generators of the oscillators added with `add_oscillator`, which are
+    # called on the time array - the built-in oscillators only have sample
+    # grid generators
+    None,
+    None,
+    None,
+    None
+)
+
+_grid_oscs: tuple[GridGenerator | None, ...] = (
+    # Faster generators for the built-in oscillators, which are used when the
+    # time is a uniform sample grid i.e. a `Time` object
+    _sin_recurrence,
+    _sqr_accumulator,
+    _tri_accumulator,
+    _saw_accumulator
+)
+
 
 def add_oscillator(name: str, wave_func: WaveGenerator) -> None:
     """\
@@ -150,26 +355,78 @@ def add_oscillator(name: str, wave_func: WaveGenerator) -> None:
     Notes:
 
     The `wave_func` argument accepts any callable which accepts a NumPy array of
-    the time, a floating point frequency value, and a floating point phase
-    value. The callable should return a NumPy array of the same length as the
-    time array.
+    the time, a floating point frequency value, a floating point phase value,
+    and an output NumPy array of the same length as the time array. The
+    callable should write the waveform into the output array and return it.
     """
-    if name in _oscs:
+    global _oscs, _grid_oscs
+
+    if name in _wave_ids:
         raise NameError(f'Wave name \'{name}\' already exists!')
 
-    _oscs[name] = wave_func
+    _wave_ids[name] = len(_oscs)
+
+    _oscs += (wave_func,)
+    _grid_oscs += (None,)
 
 
 def print_oscillators() -> None:
     """\
     Prints the avalible oscillators.
     """
-    print('[PySyn] Avalible oscillators: ' + ', '.join(_oscs.keys()) + '.')
+    print('[PySyn] Avalible oscillators: ' + ', '.join(_wave_ids) + '.')
 
 
 # Oscillator class -------------------------------------------------------------
 
 
+def _bind_oscillator(wave_id: int) -> OscillatorCall:
+    """\
+    [PySyn Internal] Resolves a wave into a function which oscillates it.
+
+    Args:
+
+    wave_id: int
+        ID of the wave/oscillator.
+
+    Returns:
+
+    OscillatorCall
+        Function which accepts a time object, a frequency, a phase and an
+        output array, and returns the waveform - see `Oscillator.oscillate`.
+
+    Notes:
+
+    Oscillators with a uniform sample grid generator use it, otherwise the
+    wave function is called on the time array.
+    """
+    wave_func = _oscs[wave_id]
+    grid_func = _grid_oscs[wave_id]
+
+    if grid_func is None:
+        def call(
+                t: Time,
+                freq: float,
+                phase: float,
+                out: npt.NDArray
+            ) -> npt.NDArray:
+            return wave_func(t.get_array(), freq, phase, out)
+    else:
+        def call(
+                t: Time,
+                freq: float,
+                phase: float,
+                out: npt.NDArray
+            ) -> npt.NDArray:
+            return grid_func(
+                _TAU * freq / Time.get_sampling_rate(),
+                _TAU * freq * t.start + phase,
+                out
+            )
+
+    return call
+
+
 class Oscillators(Enum):
     """\
     Oscillators:
@@ -206,25 +463,35 @@ class Oscillator:
     oscillate(t: npt.NDArray) -> npt.NDArray
     """
 
-    __slots__ = ['_wave', '_wave_func']
+    __slots__ = ['_wave_id', '_call']
 
-    def __init__(self, wave: str | Wave) -> None:
+    def __init__(self, wave: str | Wave | Oscillators) -> None:
         """\
         Instantiates an oscillator.
 
         Args:
 
-        wave: str | Wave
-            Name of the wave/oscillator.
+        wave: str | Wave | Oscillators
+            Name of the wave/oscillator, or one of the default oscillators.
         """
-        self._wave: str | Wave = wave
+        if isinstance(wave, Oscillators):
+            wave = wave.value
 
-        if _oscs.get(self._wave) is None:
-            raise NameError(f'Wave \'{self._wave}\' does not exist!')
+        wave_id = _wave_ids.get(wave)
 
-        self._wave_func: WaveGenerator = _oscs[self._wave]
+        if wave_id is None:
+            raise NameError(f'Wave \'{wave}\' does not exist!')
 
-    def oscillate(self, t: Time, freq: float, phase: float) -> npt.NDArray:
+        self._wave_id: int = wave_id
+        self._call: OscillatorCall = _bind_oscillator(self._wave_id)
+
+    def oscillate(
+            self,
+            t: Time,
+            freq: float,
+            phase: float,
+            out: npt.NDArray | None = None
+        ) -> npt.NDArray:
         """\
         Oscillates to produce a periodic wave.
 
@@ -239,23 +506,173 @@ class Oscillator:
         phase: float
             Phase of the oscillator in radians. Defaults to 0.
 
+        out: npt.NDArray | None
+            Array which the waveform is written into, with one element per
+            sample of the time object. Defaults to None, in which case a new
+            array is allocated.
+
         Returns:
 
         npt.NDarray
             Array of the waveform at a particular sampling rate.
         """
-        return self._wave_func(t.get_array(), freq, phase)
+        num_samples = t.get_num_samples()
+
+        if out is None:
+            out = np.empty(num_samples, dtype=_SAMPLE_DTYPE)
+        elif len(out) != num_samples:
+            raise ValueError(
+                f'Output array has {len(out)} samples, but the time object has '
+                f'{num_samples} samples!'
+            )
+
+        return self._call(t, freq, phase, out)
 
     def __str__(self) -> str:
-        return f'Oscillator(wave=\'{self._wave}\')'
+        wave = list(_wave_ids)[self._wave_id]
+        return f'Oscillator(wave=\'{wave}\')'
 
     def __repr__(self) -> str:
         return str(self)
 
 
+# Oscillator banks -------------------------------------------------------------
+
+
+def oscillate_bank(
+        t: Time,
+        freqs: npt.ArrayLike,
+        phases: npt.ArrayLike,
+        amps: npt.ArrayLike,
+        out: npt.NDArray | None = None
+    ) -> npt.NDArray:
+    """\
+    Oscillates a bank of sine waves and sums them into a single waveform.
+
+    Args:
+
+    t: Time
+        Time object which defines the duration of the oscillators.
+
+    freqs: npt.ArrayLike
+        Frequency of each sine wave in the bank.
+
+    phases: npt.ArrayLike
+        Phase of each sine wave in radians.
+
+    amps: npt.ArrayLike
+        Amplitude of each sine wave.
+
+    out: npt.NDArray | None
+        Array which the summed waveform is written into, with one element per
+        sample of the time object. Defaults to None, in which case a new array
+        is allocated.
+
+    Returns:
+
+    npt.NDArray
+        Array of the summed waveform at a particular sampling rate.
+
+    Notes:
+
+    This is the core of additive synthesis: for harmonics of a fundamental
+    frequency `f0`, use `freqs = k * f0` for `k = 1, 2, ...`. The whole bank is
+    calculated at once, with the weighted sum done as a single matrix-vector
+    product, rather than one oscillator at a time.
+
+    The time array is processed in blocks, such that the bank's phase angles
+    for a block fit in the L2 cache.
+    """
+    omegas = _TAU * np.asarray(freqs, dtype=float)
+    phases = np.asarray(phases, dtype=float)[:, None]
+    amps = np.asarray(amps, dtype=float)
+
+    t_arr = t.get_array()
+    if out is None:
+        out = np.empty(len(t_arr), dtype=_SAMPLE_DTYPE)
+
+    block_size = max(1, _L2_CACHE_SIZE // (8 * max(1, len(omegas))))
+    theta_buf = np.empty((len(omegas), min(block_size, len(t_arr))))
+
+    for i in range(0, len(t_arr), block_size):
+        t_block = t_arr[i:i + block_size]
+        theta = theta_buf[:, :len(t_block)]
+
+        np.multiply.outer(omegas, t_block, out=theta)
+        theta += phases
+        np.sin(theta, out=theta)
+
+        np.matmul(amps, theta, out=out[i:i + block_size])
+
+    return out
+
+
 # Oscillator calculations ------------------------------------------------------
 
 
+@lru_cache(maxsize=32)
+def _next_fast_len(n: int) -> int:
+    """\
+    [PySyn Internal] Finds the next FFT length with no prime factor above 11.
+
+    Args:
+
+    n: int
+        Minimum length of the FFT.
+
+    Returns:
+
+    int
+        Smallest 11-smooth length which is at least `n`.
+
+    Notes:
+
+    NumPy's FFT (pocketfft) has native radices of 2, 3, 4, 5, 7 and 11, so
+    lengths with no larger prime factor are returned unchanged - e.g. 44100,
+    one second of samples, is not padded.
+    """
+    if n < 1:
+        return n
+
+    m = n
+
+    while True:
+        remainder = m
+
+        for prime in (2, 3, 5, 7, 11):
+            while remainder % prime == 0:
+                remainder //= prime
+
+        if remainder == 1:
+            return m
+
+        m += 1
+
+
+@lru_cache(maxsize=32)
+def _rfft_freqs(n: int, sampling_rate: int) -> npt.NDArray:
+    """\
+    [PySyn Internal] Cached frequency axis of a real FFT.
+
+    Args:
+
+    n: int
+        Number of samples in the transformed waveform.
+
+    sampling_rate: int
+        Sampling rate of the waveform in Hz.
+
+    Returns:
+
+    npt.NDArray
+        Read-only array of the non-negative sample frequencies.
+    """
+    freq_arr = np.fft.rfftfreq(n, 1/sampling_rate)
+    freq_arr.flags.writeable = False
+
+    return freq_arr
+
+
 def fourier_transform(wave: npt.NDArray) -> tuple[npt.NDArray, npt.NDArray]:
     """\
     Calculates the Fourier transform for a given oscillator.
@@ -264,8 +681,32 @@ def fourier_transform(wave: npt.NDArray) -> tuple[npt.NDArray, npt.NDArray]:
 
     wave: npt.NDArray
         Waveform (calculated from some oscillator).
+
+    Notes:
+
+    Waveforms are real-valued, so only the non-negative frequencies are
+    calculated - the negative half of the spectrum is its complex conjugate.
+
+    NumPy caches the FFT plan for each length, and the frequency axis is cached
+    here too, so repeated transforms of equal length tracks are cheaper.
+
+    Waveforms whose length has a prime factor above 11 are zero-padded to the
+    next length without one, as the FFT is much slower for lengths with large
+    prime factors. Their frequency resolution is therefore
+    `sampling_rate / padded_length` rather than `sampling_rate / len(wave)`.
+    Other lengths, e.g. whole seconds of samples, are transformed unpadded, so
+    their bins stay at exact multiples of `sampling_rate / len(wave)`.
+
+    The spectrum has the precision of the waveform, i.e. single precision
+    waveforms give a single precision (complex64) spectrum. NumPy 2 transforms
+    single precision natively, whereas older versions always transform in
+    double precision, so the spectrum is cast back.
     """
-    fft_arr = np.fft.fft(wave)
-    freq_arr = np.fft.fftfreq(len(fft_arr), 1/Time.get_sampling_rate())
+    n = _next_fast_len(len(wave))
+
+    fft_arr = np.fft.rfft(wave, n=n).astype(
+        np.result_type(wave.dtype, np.complex64), copy=False
+    )
+    freq_arr = _rfft_freqs(n, Time.get_sampling_rate())
 
     return freq_arr, fft_arr
@@ -21,9 +21,11 @@ class Time:
     Methods:
 
     get_array() -> npt.NDArray
+
+    get_num_samples() -> int
     """
 
-    __slots__ = ['duration', 'start']
+    __slots__ = ['duration', 'start', '_cache_key', '_cached_array']
 
     # Keeps a global sampling rate
 
@@ -36,6 +38,9 @@ class Time:
         self.duration = duration
         self.start = start
 
+        self._cache_key: tuple[float, float, int] | None = None
+        self._cached_array: npt.NDArray | None = None
+
     def get_array(self) -> npt.NDArray:
         """\
         Calculates an array for the duration of the oscillator.
@@ -43,14 +48,37 @@ class Time:
         Returns:
 
         npt.NDArray
-            Array defining the duration of the oscillator.
+            Read-only array defining the duration of the oscillator.
+
+        Notes:
+
+        The array is cached and reused until the duration, start or sampling
+        rate changes.
+
+        The array is kept in double precision: in single precision, the time
+        resolution of long tracks degrades enough to audibly detune the phase
+        of high frequency oscillators.
+        """
+        key = (self.start, self.duration, Time._sampling_rate)
+
+        if self._cache_key == key:
+            return self._cached_array
+
+        arr = np.arange(self.get_num_samples(), dtype=float)
+        arr *= 1 / Time._sampling_rate
+        arr += self.start
+        arr.flags.writeable = False
+
+        self._cache_key = key
+        self._cached_array = arr
+
+        return arr
+
+    def get_num_samples(self) -> int:
+        """\
+        Calculates the number of samples for the duration of the oscillator.
         """
-        return np.linspace(
-            self.start,
-            self.start + self.duration,
-            int(Time._sampling_rate * self.duration),
-            endpoint=False
-        )
+        return int(Time._sampling_rate * self.duration)
 
     @classmethod
     def get_sampling_rate(cls) -> int:
@@ -1,5 +1,5 @@
 """
-pysyn / mixer.py
+pysyn / track.py
 --------------------------------------------------------------------------------
 Aditya Marathe
 
@@ -8,10 +8,65 @@ Track class.
 
 __all__ = ['Track']
 
+from typing import Iterator
+
+from contextlib import AbstractContextManager
+from contextlib import nullcontext
+
 import numpy as np
 import numpy.typing as npt
 
+from pysyn.osc import _SAMPLE_DTYPE
+from pysyn.osc import _TAU
 from pysyn.osc import Oscillator
+from pysyn.time import Time
+
+
+# Semitones of each natural note from A in the same octave
+_NOTE_OFFSETS: dict[str, int] = {
+    'C': -9, 'D': -7, 'E': -5, 'F': -4, 'G': -2, 'A': 0, 'B': 2
+}
+
+_ACCIDENTALS: dict[str, int] = {'#': 1, 'b': -1}
+
+_REST: str = 'R'
+
+
+def _note_to_freq(note: str) -> float:
+    """\
+    [PySyn Internal] Converts a note in scientific pitch notation to frequency.
+
+    Args:
+
+    note: str
+        Note name e.g. 'A4', 'C#5' or 'Eb3', or 'R' for a rest.
+
+    Returns:
+
+    float
+        Frequency of the note in Hz (with A4 = 440 Hz), or zero for a rest.
+    """
+    if note == _REST:
+        return 0.
+
+    letter = note[:1].upper()
+    accidentals = note[1:].rstrip('-0123456789')
+    octave = note[1 + len(accidentals):]
+
+    if (
+        letter not in _NOTE_OFFSETS
+        or any(acc not in _ACCIDENTALS for acc in accidentals)
+        or not octave.removeprefix('-').isdigit()
+    ):
+        raise ValueError(f'Note \'{note}\' is not valid!')
+
+    semitones = (
+        12 * (int(octave) - 4)
+        + _NOTE_OFFSETS[letter]
+        + sum(_ACCIDENTALS[acc] for acc in accidentals)
+    )
+
+    return 440. * 2 ** (semitones / 12)
 
 
 class Track:
@@ -22,26 +77,153 @@ class Track:
     compilation of music.
     """
 
+    __slots__ = [
+        '_osc', '_steps', '_filters', '_freqs', '_durations', '_num_samples',
+        '_starts', '_phases'
+    ]
+
     def __init__(
             self,
             osc: Oscillator,
             steps: list[tuple[str, str]]
         ) -> None:
         """\
-        
+        Instantiates a track.
+
+        Args:
+
+        osc: Oscillator
+            Oscillator which plays the steps of this track.
+
+        steps: list[tuple[str, str]]
+            Step sequence of (note, duration) pairs, where the note is in
+            scientific pitch notation (or 'R' for a rest) and the duration is
+            in seconds.
         """
         self._osc: Oscillator = osc
         self._steps: list[tuple[str, str]] = steps
 
         self._filters = []  # TODO
 
-    def compile_(self) -> npt.NDArray:
+        # Schedule of the steps, parsed once so compiling is just oscillating
+
+        sampling_rate = Time.get_sampling_rate()
+
+        self._freqs: npt.NDArray = np.array(
+            [_note_to_freq(note) for note, _ in steps], dtype=float
+        )
+        self._durations: npt.NDArray = np.array(
+            [float(duration) for _, duration in steps], dtype=float
+        )
+        self._num_samples: npt.NDArray = (
+            sampling_rate * self._durations
+        ).astype(np.int64)
+
+        # Sample offset and oscillator phase at the start of each step, such
+        # that the phase carries over between steps
+
+        self._starts: npt.NDArray = np.zeros(len(steps), dtype=np.int64)
+        np.cumsum(self._num_samples[:-1], out=self._starts[1:])
+
+        self._phases: npt.NDArray = np.zeros(len(steps))
+        np.cumsum(
+            _TAU * self._freqs[:-1] * self._num_samples[:-1]
+            / sampling_rate,
+            out=self._phases[1:]
+        )
+        np.remainder(self._phases, _TAU, out=self._phases)
+
+    def get_num_samples(self) -> int:
+        """\
+        Calculates the number of samples in the compiled track.
+        """
+        return int(self._num_samples.sum())
+
+    def _iter_notes(self) -> Iterator[tuple[int, int, Time, float, float]]:
+        """\
+        [PySyn Internal] Iterates over the steps of the schedule, skipping rests.
+
+        Yields:
+
+        tuple[int, int, Time, float, float]
+            Start sample, number of samples, time object, frequency and phase
+            of each step.
+        """
+        notes = np.flatnonzero(self._freqs)  # Rests have zero frequency
+
+        for start, num_samples, duration, freq, phase in zip(
+                self._starts[notes].tolist(),
+                self._num_samples[notes].tolist(),
+                self._durations[notes].tolist(),
+                self._freqs[notes].tolist(),
+                self._phases[notes].tolist()
+            ):
+            yield start, num_samples, Time(duration=duration), freq, phase
+
+    def compile_to(
+            self,
+            out: npt.NDArray,
+            level: float = 1.,
+            lock: AbstractContextManager | None = None
+        ) -> None:
+        """\
+        Compiles the track, adding it to an existing buffer.
+
+        Args:
+
+        out: npt.NDArray
+            Buffer which the track is added to - must have at least as many
+            samples as the track.
+
+        level: float
+            Level/volume of the track. Defaults to 1.
+
+        lock: AbstractContextManager | None
+            Lock (e.g. a `threading.Lock`) held while each step is added to the
+            buffer, for when several threads add to the same buffer. Defaults
+            to None.
+
+        Notes:
+
+        Each step is oscillated into a scratch buffer, which is reused for every
+        step, then added to the buffer - so the whole track is never held in
+        memory separately. The phase of the oscillator carries over between
+        steps, so there are no clicks at step boundaries.
         """
-        WIP:
+        guard = nullcontext() if lock is None else lock
+
+        scratch = np.empty(
+            self._num_samples[self._freqs > 0].max(initial=0),
+            dtype=out.dtype
+        )
+
+        for start, num_samples, t, freq, phase in self._iter_notes():
+            wave = self._osc.oscillate(
+                t, freq, phase, out=scratch[:num_samples]
+            )
+            wave *= level
+
+            with guard:
+                out[start:start + num_samples] += wave
 
-        1. Convert the steps into frequencies and durations
-        2. Oscillate at the given frequencies and durations
-        3. Append or sum the resulting waves
+    def compile_(self) -> npt.NDArray:
+        """\
+        Compiles the track.
+
+        Returns:
+
+        npt.NDArray
+            Array of the waveform of the whole track.
 
+        Notes:
+
+        Each step is oscillated straight into its slice of the output array.
         """
-        ...
\ No newline at end of file
+        out = np.zeros(self.get_num_samples(), dtype=_SAMPLE_DTYPE)
+
+        for start, num_samples, t, freq, phase in self._iter_notes():
+            self._osc.oscillate(
+                t, freq, phase, out=out[start:start + num_samples]
+            )
+
+        return out
@@ -0,0 +1,61 @@
+"""\
+pysyn / tests / test_mixer.py
+--------------------------------------------------------------------------------
+Aditya Marathe
+
+Tests for mixing tracks.
+"""
+
+import os
+import unittest
+
+from unittest import mock
+
+import numpy as np
+
+from pysyn.mixer import Mixer
+from pysyn.osc import Oscillator
+
+
+def _build_mixer() -> Mixer:
+    mixer = Mixer()
+    steps = [('A4', '0.05'), ('C#5', '0.1'), ('R', '0.02'), ('E3', '0.3')]
+
+    for i, wave in enumerate(('Sine', 'Square', 'Triangle', 'Sawtooth')):
+        mixer.add_track(Oscillator(wave), steps * (i + 1), f'Track {i}')
+        mixer._levels[f'Track {i}'] = 0.2 * (i + 1)
+
+    return mixer
+
+
+class TestMixer(unittest.TestCase):
+
+    def test_threaded_matches_sequential(self) -> None:
+        mixer = _build_mixer()
+
+        with mock.patch.object(os, 'cpu_count', return_value=1):
+            mixer.compile_()
+            sequential = mixer._mix.copy()
+
+        with mock.patch.object(os, 'cpu_count', return_value=3):
+            threaded = np.zeros(len(sequential), dtype=np.float32)
+            mixer.compile_to(threaded)
+
+        # Only the order of the float32 additions may differ
+        np.testing.assert_allclose(threaded, sequential, atol=1e-5)
+
+    def test_mix_is_sum_of_tracks(self) -> None:
+        mixer = _build_mixer()
+        mixer.compile_()
+
+        expected = np.zeros(len(mixer._mix))
+
+        for name, track in mixer._tracks.items():
+            wave = track.compile_()
+            expected[:len(wave)] += mixer._levels[name] * wave
+
+        np.testing.assert_allclose(mixer._mix, expected, atol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""\
+pysyn / tests / test_track.py
+--------------------------------------------------------------------------------
+Aditya Marathe
+
+Tests for the note parser, step scheduling and compilation of tracks.
+"""
+
+import math
+import unittest
+
+import numpy as np
+
+from pysyn.osc import Oscillator
+from pysyn.time import Time
+from pysyn.track import _note_to_freq
+from pysyn.track import Track
+
+
+class TestNoteToFreq(unittest.TestCase):
+
+    def test_notes(self) -> None:
+        cases = {
+            'A4': 440.,
+            'a4': 440.,
+            'A5': 880.,
+            'A-1': 13.75,
+            'C4': 261.6255653,
+            'C#5': 554.3652620,
+            'Db5': 554.3652620,
+            'Eb3': 155.5634919,
+            'B#3': 261.6255653,
+            'R': 0.
+        }
+
+        for note, freq in cases.items():
+            with self.subTest(note=note):
+                self.assertAlmostEqual(_note_to_freq(note), freq, places=6)
+
+    def test_invalid_notes(self) -> None:
+        for note in ('A--1', 'H4', 'A', 'Ax4', '4', '', 'A4b', 'A-'):
+            with self.subTest(note=note):
+                with self.assertRaisesRegex(ValueError, 'is not valid'):
+                    _note_to_freq(note)
+
+
+class TestTrack(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.sampling_rate = Time.get_sampling_rate()
+
+    def test_length_and_rests(self) -> None:
+        track = Track(
+            Oscillator('Square'),
+            [('A4', '0.5'), ('R', '0.25'), ('C5', '0.25')]
+        )
+        wave = track.compile_()
+
+        self.assertEqual(track.get_num_samples(), self.sampling_rate)
+        self.assertEqual(len(wave), self.sampling_rate)
+
+        rest = slice(self.sampling_rate // 2, 3 * self.sampling_rate // 4)
+        self.assertFalse(np.any(wave[rest]))
+        self.assertTrue(np.all(wave[:rest.start] != 0))
+
+    def test_phase_continuity(self) -> None:
+        # The first step ends part way through a cycle, so a phase reset at
+        # the boundary would jump
+        steps = [('A4', '0.0101'), ('C5', '0.02')]
+        track = Track(Oscillator('Sine'), steps)
+        wave = track.compile_()
+
+        boundary = int(self.sampling_rate * 0.0101)
+        phase = 2 * math.pi * 440. * boundary / self.sampling_rate
+
+        self.assertAlmostEqual(
+            float(wave[boundary]), math.sin(phase), places=5
+        )
+
+        max_step = 2 * math.pi * _note_to_freq('C5') / self.sampling_rate
+        self.assertLessEqual(
+            float(np.abs(np.diff(wave)).max()), max_step + 1e-5
+        )
+
+    def test_compile_to_matches_compile(self) -> None:
+        track = Track(
+            Oscillator('Triangle'),
+            [('E3', '0.1'), ('R', '0.05'), ('G#4', '0.15')]
+        )
+        out = np.zeros(track.get_num_samples() + 100, dtype=np.float32)
+        track.compile_to(out, level=0.5)
+
+        np.testing.assert_allclose(
+            out[:track.get_num_samples()], 0.5 * track.compile_(), atol=1e-6
+        )
+        self.assertFalse(np.any(out[track.get_num_samples():]))
+
+
+if __name__ == '__main__':
+    unittest.main()